@@ -1,7 +1,14 @@
+import os
+import ast
 import sys
+import functools
+import pathlib
 import platform
+import pytest
 print(platform.python_version())
 
+from tests.constants import SCRIPT_PATH
+
 
 from valis import slide_io
 def pytest_sessionstart(session):
@@ -18,3 +25,45 @@ def pytest_sessionfinish(session, exitstatus):
     returning the exit status to the system.
     """
     slide_io.kill_jvm()
+
+
+@functools.lru_cache(maxsize=8)
+def _read(path, mtime_ns):
+    """Read a UTF-8 text file. Cached until the file's modification time changes"""
+    return pathlib.Path(path).read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def script_content():
+    """Read script content once for the whole test session"""
+    return _read(SCRIPT_PATH, os.stat(SCRIPT_PATH).st_mtime_ns)
+
+
+@pytest.fixture(scope="session")
+def script_ast(script_content):
+    """Parse valis.py once for the whole test session"""
+    return ast.parse(script_content)
+
+
+@pytest.fixture(scope="session")
+def script_func_names(script_ast):
+    """Names of all functions defined in valis.py"""
+    return frozenset(node.name for node in ast.walk(script_ast)
+                     if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)))
+
+
+@pytest.fixture(scope="session")
+def script_imports(script_ast):
+    """Names of modules imported by valis.py, including names imported from packages"""
+    imports = set()
+    for node in ast.walk(script_ast):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.add(alias.name)
+                imports.add(alias.name.split('.')[0])
+        elif isinstance(node, ast.ImportFrom):
+            if node.module is not None:
+                imports.add(node.module)
+            imports.update(alias.name for alias in node.names)
+
+    return frozenset(imports)
@@ -0,0 +1,5 @@
+"""Constants shared by the tests and conftest.py"""
+
+import os
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'valis.py')
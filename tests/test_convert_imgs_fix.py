@@ -3,7 +3,9 @@
 import pytest
 import os
 import sys
+import time
 from unittest.mock import Mock, patch, MagicMock
+import numpy as np
 
 # Add parent directory to path to import valis
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
@@ -144,6 +146,44 @@ class TestConvertImgsFix:
             except KeyError as e:
                 pytest.fail(f"Should handle empty reader dict gracefully: {e}")
 
+    def test_convert_imgs_in_parallel_keeps_order(self, mock_valis):
+        """Test that slides read in parallel are added in their original order, and empty slides are skipped"""
+
+        n_slides = 12
+        mock_valis.original_img_list = [f'slide{i}.tiff' for i in range(n_slides)]
+        mock_valis.name_dict = {f: f.replace('.tiff', '') for f in mock_valis.original_img_list}
+        mock_valis.image_type = None
+        mock_valis.reference_img_f = None
+        empty_names = {'slide3', 'slide8'}
+
+        named_reader_dict = {}
+        for i in range(n_slides):
+            reader = Mock()
+            reader.metadata.slide_dimensions = np.array([[1000, 1000]])
+            # Earlier slides take longer to read, so they finish last
+            reader.slide2vips = Mock(side_effect=lambda level, delay=0.01*(n_slides - i): time.sleep(delay) or Mock(width=1000, height=1000))
+            named_reader_dict[f'slide{i}'] = reader
+
+        def _create_slide(src_f, img, valis_obj, reader, name):
+            slide_obj = Mock(is_empty=name in empty_names, img_type='brightfield')
+            slide_obj.name = name
+            return slide_obj
+
+        with patch('valis.valtils.get_name', side_effect=lambda x: x.replace('.tiff', '')), \
+             patch('valis.valtils.print_warning'), \
+             patch('valis.registration.Valis.create_img_reader_dict', return_value=named_reader_dict), \
+             patch('valis.registration.Valis.check_img_max_dims'), \
+             patch('valis.warp_tools.vips2numpy', return_value=[[0]]), \
+             patch('valis.registration.Slide', side_effect=_create_slide):
+
+            mock_valis.convert_imgs()
+
+        expected_names = [f'slide{i}' for i in range(n_slides) if f'slide{i}' not in empty_names]
+        assert list(mock_valis.slide_dict.keys()) == expected_names
+        assert set(mock_valis._empty_slides.keys()) == empty_names
+        assert mock_valis.size == len(expected_names)
+        assert mock_valis.image_type == 'brightfield'
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,76 @@
+"""Test batched feature detection"""
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add parent directory to path to import valis
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from valis import feature_detectors
+
+
+class SumFD(feature_detectors.KorniaFD):
+    """Stub detector whose features only depend on each image's shape and content"""
+
+    def __init__(self):
+        super().__init__(device="cpu")
+        self.batch_shapes = []
+
+    def _detect_and_compute_tensor(self, tensor_img):
+        self.batch_shapes.append(tuple(tensor_img.shape))
+        return [(np.array([[t.shape[-1], t.shape[-2]]], dtype=float), np.array([[t.sum().item()]])) for t in tensor_img]
+
+
+class LegacySumFD(feature_detectors.KorniaFD):
+    """Stub detector that only overrides `_detect_and_compute`, like subclasses written before batching"""
+
+    def __init__(self):
+        super().__init__(device="cpu")
+
+    def _detect_and_compute(self, image, *args, **kwargs):
+        return np.array([[image.shape[1], image.shape[0]]], dtype=float), np.array([[image.sum()]], dtype=float)
+
+
+class TestKorniaBatchDetection:
+    """Test that batched detection matches detecting features in each image separately"""
+
+    def test_batch_matches_per_image_detection(self):
+        rng = np.random.default_rng(0)
+        img_list = [rng.integers(0, 255, shape, dtype=np.uint8) for shape in [(20, 30), (25, 30), (20, 30), (20, 30)]]
+        fd = SumFD()
+
+        batch_features = fd.batch_detect_and_compute(img_list, batch_size=2)
+        assert len(batch_features) == len(img_list)
+
+        # Only images with the same shape are batched, so nothing is padded
+        assert sorted(s[0] for s in fd.batch_shapes) == [1, 1, 2]
+
+        for img, (kp, desc) in zip(img_list, batch_features):
+            expected_kp, expected_desc = fd._detect_and_compute(img)
+            assert np.array_equal(kp, expected_kp)
+            assert np.allclose(desc, expected_desc)
+
+    def test_batch_without_tensor_hook(self):
+        """Test that subclasses only overriding `_detect_and_compute` still detect features one image at a time"""
+        rng = np.random.default_rng(0)
+        img_list = [rng.integers(0, 255, shape, dtype=np.uint8) for shape in [(20, 30), (25, 30), (20, 30)]]
+        fd = LegacySumFD()
+
+        batch_features = fd.batch_detect_and_compute(img_list, batch_size=2)
+        assert len(batch_features) == len(img_list)
+        for img, (kp, desc) in zip(img_list, batch_features):
+            expected_kp, expected_desc = fd.detect_and_compute(img)
+            assert np.array_equal(kp, expected_kp)
+            assert np.array_equal(desc, expected_desc)
+
+    def test_missing_hooks_raise(self):
+        """Test that a subclass overriding neither hook gets a clear error"""
+        fd = feature_detectors.KorniaFD(device="cpu")
+        with pytest.raises(NotImplementedError, match="_detect_and_compute_tensor"):
+            fd.detect_and_compute(np.zeros((20, 30), dtype=np.uint8))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
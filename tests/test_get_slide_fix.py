@@ -93,6 +93,17 @@ class TestGetSlideFix:
             result = mock_valis.get_slide('test.tiff')
             assert result is None, "Should return None for duplicate names"
 
+    def test_get_slide_with_file_name(self, mock_valis):
+        """Test that get_slide finds a slide using only the file name"""
+
+        mock_slide = Mock()
+        mock_valis.name_dict = {'/path/to/test.tiff': 'assigned_name'}
+        mock_valis.slide_dict = {'assigned_name': mock_slide}
+
+        with patch('valis.valtils.get_name', return_value='test'):
+            assert mock_valis.get_slide('test.tiff') == mock_slide
+            assert mock_valis.get_slide('assigned_name') == mock_slide
+
     def test_get_slide_empty_dictionaries(self, mock_valis):
         """Test that get_slide handles empty dictionaries without error"""
         
@@ -124,6 +135,27 @@ class TestGetSlideFix:
                 except UnboundLocalError as e:
                     pytest.fail(f"UnboundLocalError should not occur for input '{test_input}': {e}")
 
+    def test_sorted_img_f_list_cached_until_slides_change(self, mock_valis):
+        """Test that the sorted image lists are reused until the slides change"""
+
+        slide_a = Mock(stack_idx=1)
+        slide_b = Mock(stack_idx=0)
+        mock_valis.original_img_list = ['/path/to/a.tiff', '/path/to/b.tiff']
+        mock_valis.name_dict = {'/path/to/a.tiff': 'a', '/path/to/b.tiff': 'b'}
+        mock_valis.slide_dict = {'a': slide_a, 'b': slide_b}
+
+        assert mock_valis.get_sorted_img_f_list() == ['/path/to/b.tiff', '/path/to/a.tiff']
+        assert mock_valis.get_live_sorted_img_f_list() == ['/path/to/b.tiff', '/path/to/a.tiff']
+
+        # Cached lists are used until the caches are cleared
+        slide_a.stack_idx, slide_b.stack_idx = 0, 1
+        assert mock_valis.get_sorted_img_f_list() == ['/path/to/b.tiff', '/path/to/a.tiff']
+
+        del mock_valis.slide_dict['b']
+        mock_valis.original_img_list = ['/path/to/a.tiff']
+        mock_valis._clear_slide_caches()
+        assert mock_valis.get_sorted_img_f_list() == ['/path/to/a.tiff']
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
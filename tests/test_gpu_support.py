@@ -1,7 +1,10 @@
 """Test GPU support and device detection"""
 
+import os
+import sys
 import pytest
 import torch
+from unittest.mock import Mock, patch
 import numpy as np
 from valis import valtils
 from valis import non_rigid_registrars
@@ -28,6 +31,23 @@ class TestGPUSupport:
         device = valtils.get_device(force_cpu=True)
         assert device == 'cpu'
 
+    def test_device_cache_reset(self, monkeypatch):
+        """Test that cached device detection can be refreshed"""
+        valtils._reset_device_cache()
+        monkeypatch.setattr(torch.cuda, 'is_available', lambda: False)
+        assert valtils.is_gpu_available() == False
+        assert valtils.get_device() == 'cpu'
+
+        # Cached result is used until the cache is reset
+        monkeypatch.setattr(torch.cuda, 'is_available', lambda: True)
+        assert valtils.get_device() == 'cpu'
+
+        valtils._reset_device_cache()
+        assert valtils.get_device() == 'cuda'
+
+        monkeypatch.undo()
+        valtils._reset_device_cache()
+
     def test_raft_warper_gpu_detection(self):
         """Test RAFTWarper device detection"""
         warper = non_rigid_registrars.RAFTWarper()
@@ -39,6 +59,161 @@ class TestGPUSupport:
         warper = non_rigid_registrars.RAFTWarper(device='cpu')
         assert warper.device == 'cpu'
 
+    def test_raft_warper_cpu_not_compiled(self):
+        """Test RAFTWarper only compiles the model when running on the GPU"""
+        warper = non_rigid_registrars.RAFTWarper(device='cpu', use_tensorrt=True)
+        assert warper.use_tensorrt == False
+        assert warper.get_model((64, 64)) is warper.model
+
+    def test_raft_warper_tensorrt_engine_cached(self, monkeypatch, tmp_path):
+        """Test RAFTWarper builds a TensorRT engine once per shape, and loads it afterwards"""
+        trt_model = Mock()
+        loaded_model = Mock()
+        fake_trt = Mock()
+        fake_trt.compile.return_value = trt_model
+        fake_trt.save.side_effect = lambda model, f, inputs: open(f, "w").close()
+        fake_trt.load.return_value.module.return_value = loaded_model
+        fake_trt.__version__ = "2.5.0"
+        monkeypatch.setitem(sys.modules, "torch_tensorrt", fake_trt)
+        monkeypatch.setattr(non_rigid_registrars, "RAFT_TRT_CACHE_DIR", str(tmp_path))
+
+        warper = non_rigid_registrars.RAFTWarper(device='cpu')
+        warper.use_tensorrt = True
+        assert warper.get_model((64, 64)) is trt_model
+        assert warper.get_model((64, 64)) is trt_model
+        assert fake_trt.compile.call_count == 1
+
+        engine_f = warper.get_engine_f(64, 64, "2.5.0")
+        assert os.path.exists(engine_f)
+        assert "64x64" in engine_f and "trt2.5.0" in engine_f
+
+        # New warper loads the saved engine instead of building it again
+        warper2 = non_rigid_registrars.RAFTWarper(device='cpu')
+        warper2.use_tensorrt = True
+        assert warper2.get_model((64, 64)) is loaded_model
+        assert fake_trt.compile.call_count == 1
+
+        # Engines built with another TensorRT version are not used
+        assert warper2.get_engine_f(64, 64, "2.6.0") != engine_f
+
+        # Engines that can't be loaded are rebuilt, instead of using the eager model
+        fake_trt.load.side_effect = RuntimeError("Engine was built for a different GPU")
+        warper3 = non_rigid_registrars.RAFTWarper(device='cpu')
+        warper3.use_tensorrt = True
+        with patch('valis.valtils.print_warning') as mock_warn:
+            assert warper3.get_model((64, 64)) is trt_model
+            assert mock_warn.call_count == 1
+
+        assert fake_trt.compile.call_count == 2
+        assert os.path.exists(engine_f)
+
+    def test_raft_warper_compile_failure_uses_eager_model(self, monkeypatch):
+        """Test RAFTWarper falls back to the eager model when torch.compile fails on the first call"""
+        monkeypatch.setitem(sys.modules, "torch_tensorrt", None)
+        compiled_model = Mock(side_effect=RuntimeError("Cannot find a working triton installation"))
+        monkeypatch.setattr(torch, "compile", Mock(return_value=compiled_model))
+
+        warper = non_rigid_registrars.RAFTWarper(device='cpu')
+        warper.use_tensorrt = True
+        warper.model = Mock(return_value="flows")
+
+        with patch('valis.valtils.print_warning') as mock_warn:
+            assert warper.run_model((64, 64), "fixed", "moving") == "flows"
+            assert mock_warn.call_count == 1
+
+        assert warper.get_model((64, 64)) is warper.model
+        assert warper.get_model((32, 32)) is warper.model
+        assert compiled_model.call_count == 1
+
+    def test_raft_warper_reuses_pinned_buffers(self):
+        """Test RAFTWarper only creates streams on the GPU, and reuses its pinned buffers"""
+        cpu_warper = non_rigid_registrars.RAFTWarper(device='cpu')
+        assert cpu_warper._copy_stream is None
+        assert cpu_warper._compute_stream is None
+
+        if torch.cuda.is_available():
+            warper = non_rigid_registrars.RAFTWarper(device='cuda')
+            buffer_a, _ = warper.get_pinned_buffer(100, torch.float32)
+            warper.get_pinned_buffer(100, torch.float32)
+            buffer_a2, _ = warper.get_pinned_buffer(50, torch.float32)
+            assert buffer_a2.data_ptr() == buffer_a.data_ptr()
+
+            tensor_list = [torch.rand(1, 3, 8, 8), torch.rand(1, 3, 8, 8)]
+            device_tensor_list = warper.to_device(tensor_list)
+            for t, device_t in zip(tensor_list, device_tensor_list):
+                assert torch.equal(t, device_t.cpu())
+
+    @pytest.mark.parametrize("device", ["cpu", "cuda"])
+    def test_raft_warper_warp_after_calc(self, device):
+        """Test buffers first used inside `calc` can be used to warp images afterwards"""
+        if device == "cuda" and not torch.cuda.is_available():
+            pytest.skip("CUDA is not available")
+
+        warper = non_rigid_registrars.RAFTWarper(device=device)
+        warper.use_tensorrt = False
+        warper.model = Mock(side_effect=lambda fixed, moving: [torch.zeros(1, 2, *fixed.shape[-2:], device=fixed.device)])
+
+        moving_img = np.random.randint(0, 255, (60, 70), dtype=np.uint8)
+        fixed_img = np.random.randint(0, 255, (60, 70), dtype=np.uint8)
+        warped_img, warp_grid, bk_dxdy = warper.register(moving_img, fixed_img)
+
+        assert np.array_equal(bk_dxdy, np.zeros((2, *moving_img.shape)))
+        assert warped_img.shape == moving_img.shape
+        assert warp_grid.shape == moving_img.shape
+
+        if device == "cuda":
+            # Pinned buffers were allocated inside inference mode, and are refilled outside of it
+            assert not any(b.is_inference() for b in warper._pinned_buffers if b is not None)
+            assert np.array_equal(warper.warp_img_on_device(moving_img, bk_dxdy), moving_img)
+
+    def test_raft_warper_warp_img_on_device(self):
+        """Test RAFTWarper warps images with displacement fields like warp_tools"""
+        warper = non_rigid_registrars.RAFTWarper(device='cpu')
+        img = np.random.randint(0, 255, (32, 48), dtype=np.uint8)
+        bk_dxdy = np.array([np.ones(img.shape), np.zeros(img.shape)])
+
+        warped = warper.warp_img_on_device(img, bk_dxdy)
+        assert warped.dtype == img.dtype
+        assert np.array_equal(warped[:, :-1], img[:, 1:])
+
+        # Base grid is cached and reused for images with the same shape
+        grid = warper.get_base_grid(img.shape)
+        assert warper.get_base_grid(img.shape) is grid
+
+        # Only grids for the most recent shapes are kept
+        for i in range(non_rigid_registrars.RAFT_BASE_GRID_CACHE_SIZE):
+            warper.get_base_grid((10 + i, 10))
+
+        assert len(warper._base_grid_cache) == non_rigid_registrars.RAFT_BASE_GRID_CACHE_SIZE
+        assert warper.get_base_grid(img.shape) is not grid
+
+    @pytest.mark.parametrize("device", ["cpu", "cuda"])
+    @pytest.mark.parametrize("interp_method", ["bilinear", "bicubic"])
+    def test_raft_warper_warp_img_on_device_matches_warp_tools(self, device, interp_method):
+        """Test warping on the device is close to warp_tools.warp_img for a smooth displacement field"""
+        if device == "cuda" and not torch.cuda.is_available():
+            pytest.skip("CUDA is not available")
+
+        from valis import warp_tools
+
+        warper = non_rigid_registrars.RAFTWarper(device=device)
+        img_shape_rc = (96, 128)
+        grid_r, grid_c = np.mgrid[0:img_shape_rc[0], 0:img_shape_rc[1]]
+        img = (100*(1 + np.sin(grid_c/7)*np.cos(grid_r/9))).astype(np.uint8)
+        bk_dxdy = np.array([3.5*np.sin(2*np.pi*grid_r/img_shape_rc[0]),
+                            2.5*np.cos(2*np.pi*grid_c/img_shape_rc[1])])
+
+        device_warped = warper.warp_img_on_device(img, bk_dxdy, interp_method=interp_method)
+        expected = warp_tools.warp_img(img, bk_dxdy=bk_dxdy, interp_method=interp_method)
+        if not isinstance(expected, np.ndarray):
+            expected = warp_tools.vips2numpy(expected)
+
+        # Edges are excluded, since pixels sampled from outside the image are handled differently
+        pad = 8
+        diff = np.abs(device_warped.astype(float) - expected.astype(float))[pad:-pad, pad:-pad]
+        assert diff.mean() < 1
+        assert diff.max() <= 3
+
     def test_simple_elastix_warper_force_cpu(self):
         """Test SimpleElastixWarper force_cpu parameter"""
         # Test default (GPU if available)
@@ -67,6 +242,14 @@ class TestGPUSupport:
         # Both should return parameter maps
         assert params_gpu is not None
         assert params_cpu is not None
+
+        # CPU params should never use the OpenCL resampler
+        cpu_resampler = params_cpu['Resampler'] if 'Resampler' in params_cpu else ()
+        assert 'OpenCLResampler' not in cpu_resampler
+
+        # GPU params only use OpenCL if elastix was built with OpenCL support
+        gpu_resampler = params_gpu['Resampler'] if 'Resampler' in params_gpu else ()
+        assert ('OpenCLResampler' in gpu_resampler) == valtils.is_elastix_opencl_available()
         
         # If GPU is available, GPU params should attempt to set OpenCL resampler
         if torch.cuda.is_available():
@@ -75,6 +75,31 @@ class TestNoneSlideHandling:
             assert valid_slide.warp_and_save_slide.called
             assert valid_slide.warp_and_save_slide.call_count == 1
 
+    def test_warp_and_save_slides_in_parallel(self, mock_valis, tmp_path):
+        """Test that warp_and_save_slides saves each slide once when using several workers"""
+
+        slide_list = []
+        for name in ['valid_slide_1', 'valid_slide_2', 'valid_slide_3']:
+            slide = Mock()
+            slide.name = name
+            slide.reader.metadata.is_rgb = True
+            slide_list.append(slide)
+
+        slides_by_f = {f"{s.name}.tiff": s for s in slide_list}
+        mock_valis.get_slide = lambda src_f: slides_by_f.get(src_f)
+        mock_valis.get_sorted_img_f_list = lambda: list(slides_by_f.keys()) + ['missing_slide.tiff']
+
+        dst_dir = str(tmp_path / "output")
+
+        with patch('valis.valtils.print_warning'), \
+             patch('valis.registration.pathlib.Path.mkdir'):
+            mock_valis.warp_and_save_slides(dst_dir, n_workers=2)
+
+        for slide in slide_list:
+            assert slide.warp_and_save_slide.call_count == 1
+            dst_f = slide.warp_and_save_slide.call_args[1]['dst_f']
+            assert dst_f == os.path.join(dst_dir, slide.name + ".ome.tiff")
+
     def test_warp_and_save_slides_with_colormap_and_none_slide(self, mock_valis, tmp_path):
         """Test that warp_and_save_slides handles None slides when creating colormap"""
         
@@ -0,0 +1,101 @@
+"""Test that valis.py configures and documents the registration pipeline"""
+
+import re
+import pytest
+
+
+# Literals that should be in valis.py
+LITERALS = [
+    # Registration pipeline
+    'micro_rigid_registrar_cls', 'MicroRigidRegistrar', 'micro_rigid_registrar_params',
+    'scale', 'tile_wh', 'RAFTWarper', 'non_rigid_registrar_cls', 'register_micro',
+    '4096', '2048',
+    # Documented steps
+    'Serial rigid registration', 'Micro-rigid registration', 'Serial non-rigid registration',
+    'Micro non-rigid registration',
+    # Timing
+    'registration_time', 'micro_time', 'warp_time',
+    # GPU
+    'GPU-accelerated', 'GPU', 'CUDA', 'automatically', 'L40',
+    'torch.cuda.is_available()', 'GPU detected',
+    # Command line interface
+    'argparse.ArgumentParser', 'he_file', 'cd8_file', '--output', '--no-gpu',
+    # Processing
+    'ChannelGetter', 'DAPI', 'thumbnail',
+]
+
+# Literals that should be in valis.py, ignoring case
+LITERALS_ANY_CASE = ['step 4b', 'micro non-rigid', 'reference']
+
+# Patterns that should match valis.py
+PATTERNS = [
+    pytest.param(re.compile(r"align_to_reference(?:=| = )True"), id="align_to_reference"),
+    pytest.param(re.compile(r"do_rigid(?:=| = )True"), id="do_rigid"),
+    pytest.param(re.compile(r"max_non_rigid_registration_dim_px(?:=| = )4096"), id="micro_non_rigid_dim"),
+    pytest.param(re.compile(r"""(?:"channel"|'channel'): 0"""), id="channel_0"),
+    pytest.param(re.compile(r"factor(?:=| = )2"), id="factor_2"),
+    pytest.param(re.compile(r"downsampled? by 2"), id="documents_2x_downsampling"),
+    pytest.param(re.compile(r"1\.\s*Serial rigid.*?2\.\s*Micro-rigid.*?3\.\s*Serial non-rigid", re.DOTALL | re.IGNORECASE),
+                 id="registration_steps_in_order"),
+]
+
+# Functions that should be defined in valis.py
+FUNCTIONS = ['downsample_slide', 'main']
+
+# Modules that should be imported by valis.py
+IMPORTS = ['argparse', 'registration', 'preprocessing', 'torch', 'pyvips']
+
+
+def _find_literals(content, literals, ignore_case=False):
+    """Find which of `literals` are in `content`, using a single regex scan"""
+    literals = sorted(set(literals), key=len, reverse=True)
+    # Lookahead so that overlapping literals are found at every position
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, literals)) + "))",
+                         re.IGNORECASE if ignore_case else 0)
+    matched = {m.group(1) for m in pattern.finditer(content)}
+    if ignore_case:
+        literals = [x.lower() for x in literals]
+        matched = {m.lower() for m in matched}
+
+    # Literals that start where a longer literal matched are only found as part of that match
+    return frozenset(x for x in literals if any(x in m for m in matched))
+
+
+@pytest.fixture(scope="module")
+def script_tokens(script_content):
+    """Set of `LITERALS` found in valis.py"""
+    return _find_literals(script_content, LITERALS)
+
+
+@pytest.fixture(scope="module")
+def present_literals(script_content):
+    """Set of `LITERALS_ANY_CASE` found in valis.py, in lower case"""
+    return _find_literals(script_content, LITERALS_ANY_CASE, ignore_case=True)
+
+
+class TestScriptContents:
+    """Checklist of what valis.py should contain"""
+
+    @pytest.mark.parametrize("needle", LITERALS)
+    def test_literal_present(self, script_tokens, needle):
+        assert needle in script_tokens, f"Script should contain '{needle}'"
+
+    @pytest.mark.parametrize("needle", LITERALS_ANY_CASE)
+    def test_literal_present_any_case(self, present_literals, needle):
+        assert needle in present_literals, f"Script should mention '{needle}'"
+
+    @pytest.mark.parametrize("pattern", PATTERNS)
+    def test_pattern_present(self, script_content, pattern):
+        assert pattern.search(script_content), f"Script should match '{pattern.pattern}'"
+
+    @pytest.mark.parametrize("func_name", FUNCTIONS)
+    def test_function_defined(self, script_func_names, func_name):
+        assert func_name in script_func_names, f"Script should have {func_name} function"
+
+    @pytest.mark.parametrize("module", IMPORTS)
+    def test_module_imported(self, script_imports, module):
+        assert module in script_imports, f"Script should import {module}"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
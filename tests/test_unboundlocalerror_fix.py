@@ -3,7 +3,7 @@
 import pytest
 import os
 import sys
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, ANY
 
 # Add parent directory to path to import valis
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
@@ -11,113 +11,55 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from valis import registration, slide_io
 
 
+_reader_instance = Mock()
+_reader_cls = Mock(return_value=_reader_instance)
+_failing_reader_cls = Mock(side_effect=Exception("Cannot read slide"))
+_existing_reader = Mock(spec=slide_io.ImageReader)
+
+# (get_slide_reader side effect, reader_dict, expected result)
+READER_CASES = [
+    # First call raises exception (simulating Maven error), second succeeds
+    pytest.param([Exception("404 Client Error: Not Found for url: https://dlcdn.apache.org/maven/maven-3/3.9.9/binaries/apache-maven-3.9.9-bin.tar.gz"),
+                  Mock()],
+                 None, {'test2': ANY}, id="get_slide_reader_exception"),
+    # get_slide_reader succeeds but instantiation fails
+    pytest.param([_failing_reader_cls, _failing_reader_cls],
+                 None, {}, id="reader_instantiation_exception"),
+    # Error path must not leave slide_reader_cls and slide_reader unbound
+    pytest.param(Exception("Test error"),
+                 None, {}, id="variables_initialized"),
+    # Provided reader is used as is
+    pytest.param(Exception("No reader for test2"),
+                 {'test1.tiff': _existing_reader}, {'test1': _existing_reader}, id="existing_reader"),
+    # First file fails at get_slide_reader, second file succeeds
+    pytest.param([Exception("Failed to get reader"), _reader_cls],
+                 None, {'test2': _reader_instance}, id="skips_on_continue"),
+]
+
+
 class TestUnboundLocalErrorFix:
     """Test that create_img_reader_dict handles exceptions properly"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_valis(self):
-        """Create a mock Valis object"""
+        """Create a mock Valis object. create_img_reader_dict doesn't modify it, so it is shared"""
         with patch('valis.registration.Valis.__init__', return_value=None):
             valis_obj = registration.Valis.__new__(registration.Valis)
             valis_obj.original_img_list = ['test1.tiff', 'test2.tiff']
             return valis_obj
 
-    def test_create_img_reader_dict_handles_get_slide_reader_exception(self, mock_valis):
-        """Test that create_img_reader_dict handles get_slide_reader exceptions gracefully"""
-        
-        # Mock get_slide_reader to raise an exception
-        with patch('valis.slide_io.get_slide_reader') as mock_get_reader, \
-             patch('valis.valtils.get_name', side_effect=lambda x: x.replace('.tiff', '')), \
-             patch('valis.valtils.print_warning'):
-            
-            # First call raises exception (simulating Maven error), second succeeds
-            mock_get_reader.side_effect = [
-                Exception("404 Client Error: Not Found for url: https://dlcdn.apache.org/maven/maven-3/3.9.9/binaries/apache-maven-3.9.9-bin.tar.gz"),
-                Mock()  # Return a mock reader class for second file
-            ]
-            
-            # Call the method
-            result = mock_valis.create_img_reader_dict(reader_dict=None, default_reader=None, series=None)
-            
-            # Should have skipped the first file and processed the second
-            assert 'test1' not in result, "Failed file should not be in result"
-            assert len(result) <= 1, "Only successful readers should be in result"
-
-    def test_create_img_reader_dict_handles_reader_instantiation_exception(self, mock_valis):
-        """Test that create_img_reader_dict handles reader instantiation exceptions gracefully"""
-        
-        # Mock scenario where get_slide_reader succeeds but instantiation fails
-        mock_reader_cls = Mock()
-        mock_reader_cls.side_effect = Exception("Cannot read slide")
-        
-        with patch('valis.slide_io.get_slide_reader', return_value=mock_reader_cls), \
-             patch('valis.valtils.get_name', side_effect=lambda x: x.replace('.tiff', '')), \
-             patch('valis.valtils.print_warning'):
-            
-            # Call the method
-            result = mock_valis.create_img_reader_dict(reader_dict=None, default_reader=None, series=None)
-            
-            # Should have skipped both files that failed instantiation
-            assert len(result) == 0, "Failed instantiations should not be in result"
-
-    def test_create_img_reader_dict_variables_initialized(self, mock_valis):
-        """Test that slide_reader_cls and slide_reader are properly initialized"""
-        
-        # This test ensures the variables are initialized before use
-        # which prevents UnboundLocalError
-        
-        with patch('valis.slide_io.get_slide_reader') as mock_get_reader, \
-             patch('valis.valtils.get_name', side_effect=lambda x: x.replace('.tiff', '')), \
-             patch('valis.valtils.print_warning'):
-            
-            # Raise exception to trigger the error path
-            mock_get_reader.side_effect = Exception("Test error")
-            
-            # This should not raise UnboundLocalError
-            try:
-                result = mock_valis.create_img_reader_dict(reader_dict=None, default_reader=None, series=None)
-                # Success - no UnboundLocalError
-                assert True
-            except UnboundLocalError as e:
-                pytest.fail(f"UnboundLocalError should not occur: {e}")
+    @pytest.mark.parametrize("reader_side_effect,reader_dict,expected", READER_CASES)
+    @patch('valis.slide_io.get_slide_reader')
+    @patch('valis.valtils.get_name', side_effect=lambda x: x.replace('.tiff', ''))
+    @patch('valis.valtils.print_warning')
+    def test_create_img_reader_dict(self, mock_print_warning, mock_get_name, mock_get_reader,
+                                    mock_valis, reader_side_effect, reader_dict, expected):
+        """Test that create_img_reader_dict skips files whose readers fail, without an UnboundLocalError"""
+        mock_get_reader.side_effect = reader_side_effect
 
-    def test_create_img_reader_dict_with_existing_reader(self, mock_valis):
-        """Test that create_img_reader_dict handles pre-existing readers correctly"""
-        
-        mock_reader = Mock(spec=slide_io.ImageReader)
-        reader_dict = {'test1.tiff': mock_reader}
-        
-        with patch('valis.valtils.get_name', side_effect=lambda x: x.replace('.tiff', '')):
-            
-            # Call the method with an existing reader
-            result = mock_valis.create_img_reader_dict(reader_dict=reader_dict, default_reader=None, series=None)
-            
-            # Should use the existing reader
-            assert 'test1' in result, "Should have test1 in result"
-            assert result['test1'] == mock_reader, "Should use the provided reader"
+        result = mock_valis.create_img_reader_dict(reader_dict=reader_dict, default_reader=None, series=None)
 
-    def test_create_img_reader_dict_skips_on_continue(self, mock_valis):
-        """Test that the continue statement properly skips problematic files"""
-        
-        with patch('valis.slide_io.get_slide_reader') as mock_get_reader, \
-             patch('valis.valtils.get_name', side_effect=lambda x: x.replace('.tiff', '')), \
-             patch('valis.valtils.print_warning'):
-            
-            # First file fails at get_slide_reader, second file succeeds
-            mock_reader_cls = Mock()
-            mock_reader_instance = Mock()
-            mock_reader_cls.return_value = mock_reader_instance
-            
-            mock_get_reader.side_effect = [
-                Exception("Failed to get reader"),  # First file fails
-                mock_reader_cls  # Second file succeeds
-            ]
-            
-            result = mock_valis.create_img_reader_dict(reader_dict=None, default_reader=None, series=None)
-            
-            # Should only have the second file
-            assert 'test2' in result, "Second file should be processed"
-            assert result['test2'] == mock_reader_instance, "Should have the correct reader instance"
+        assert result == expected
 
 
 if __name__ == '__main__':
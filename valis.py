@@ -17,11 +17,63 @@ Requirements:
 import os
 import sys
 import argparse
+import functools
+import shutil
 import time
+
+# Let libvips use all cores when downsampling and writing tiles. Has to be
+# set before pyvips is imported, when libvips reads it
+os.environ.setdefault("VIPS_CONCURRENCY", str(os.cpu_count() or 1))
 import pyvips
 from valis import registration, preprocessing, slide_io
 import torch
 
+# Slides are only read once, so don't keep operations in libvips' cache
+pyvips.cache_set_max(0)
+
+
+def get_pyramid_page(input_path, image, target_width, target_height):
+    """
+    Find a page of a multi-page tiff that is already the target size.
+    
+    Whole slide tiffs, like qptiff, often store a pyramid of downsampled
+    copies as separate pages. Using one of these avoids decoding and
+    resampling the full resolution image.
+    
+    Parameters
+    ----------
+    input_path : str
+        Path to input slide file
+    image : pyvips.Image
+        Full resolution image, opened from `input_path`
+    target_width : int
+        Width of the downsampled slide
+    target_height : int
+        Height of the downsampled slide
+    
+    Returns
+    -------
+    pyvips.Image or None
+        Page with the target size, or None if the slide isn't a
+        multi-page tiff or doesn't have a page with that size
+    """
+    if image.get_typeof("vips-loader") == 0 or \
+       not image.get("vips-loader").startswith("tiffload"):
+        return None
+    
+    if image.get_typeof("n-pages") == 0:
+        return None
+    
+    for page in range(1, image.get("n-pages")):
+        # Only the header of each page is read
+        page_image = pyvips.Image.tiffload(input_path, page=page)
+        if abs(page_image.width - target_width) <= 1 and \
+           abs(page_image.height - target_height) <= 1 and \
+           page_image.bands == image.bands:
+            return page_image
+    
+    return None
+
 
 def downsample_slide(input_path, output_path, factor=2):
     """
@@ -43,19 +95,89 @@ def downsample_slide(input_path, output_path, factor=2):
     """
     print(f"Downsampling {input_path} by factor of {factor}...")
     
-    # Load the slide using pyvips
-    image = pyvips.Image.new_from_file(input_path, access='sequential')
+    # Only the header is read here, to get the full resolution size
+    image = pyvips.Image.new_from_file(input_path)
+    target_width = image.width // factor
+    target_height = image.height // factor
     
-    # Downsample the image
-    downsampled = image.resize(1.0 / factor, kernel='lanczos3')
-    
-    # Save the downsampled image
-    downsampled.write_to_file(output_path)
+    # Use the pyramid level that is already the right size, if the slide has one
+    downsampled = get_pyramid_page(input_path, image, target_width, target_height)
+    if downsampled is not None:
+        print("Using existing pyramid level")
+    else:
+        # Downsample the image. thumbnail shrinks on load, using the nearest
+        # larger pyramid level (e.g. openslide levels), so that the full
+        # resolution image doesn't need to be decoded
+        downsampled = pyvips.Image.thumbnail(input_path, target_width,
+                                             height=target_height,
+                                             no_rotate=True)
+    
+    # Save the downsampled image as a tiled pyramid, so VALIS can read it efficiently.
+    # Tiles are encoded in parallel by libvips' threadpool
+    downsampled.tiffsave(output_path, compression='lzw', tile=True,
+                         tile_width=512, tile_height=512,
+                         pyramid=True, bigtiff=True)
     
     print(f"Downsampled slide saved to: {output_path}")
     return output_path
 
 
+@functools.lru_cache(maxsize=1)
+def _gpu_available():
+    """
+    Check if a CUDA GPU is available. The result is cached, so the
+    CUDA driver is only queried once.
+    """
+    try:
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _gpu_device_name():
+    """
+    Get the name of the first CUDA GPU. The result is cached.
+    """
+    return torch.cuda.get_device_name(0)
+
+
+def link_file(src_path, dst_path):
+    """
+    Make `src_path` available at `dst_path` without copying it, if possible.
+    
+    A hardlink is tried first, so that readers see a regular file. Hardlinks
+    require `dst_path` to be on the same filesystem as `src_path`. If that
+    isn't the case, a symlink is tried next (on Windows symlinks may need
+    extra privileges). The file is only copied if both fail.
+    
+    Parameters
+    ----------
+    src_path : str
+        Path to existing file
+    dst_path : str
+        Path where the file should be available
+    
+    Returns
+    -------
+    str
+        `dst_path`
+    """
+    try:
+        os.link(src_path, dst_path)
+    except FileExistsError:
+        pass
+    except OSError:
+        try:
+            os.symlink(os.path.abspath(src_path), dst_path)
+        except FileExistsError:
+            pass
+        except (OSError, NotImplementedError):
+            shutil.copy2(src_path, dst_path)
+    
+    return dst_path
+
+
 def main():
     """
     Main function to perform VALIS registration with HE and CD8 files.
@@ -81,6 +203,12 @@ Examples:
     
     args = parser.parse_args()
     
+    # File names used for paths and messages
+    he_basename = os.path.basename(args.he_file)
+    he_name = os.path.splitext(he_basename)[0]
+    cd8_basename = os.path.basename(args.cd8_file)
+    downsampled_he_basename = f"{he_name}_downsampled_2x.tiff"
+    
     # Validate input files
     if not os.path.exists(args.he_file):
         print(f"Error: HE file not found: {args.he_file}")
@@ -91,8 +219,8 @@ Examples:
         sys.exit(1)
     
     # Check GPU availability
-    if torch.cuda.is_available() and not args.no_gpu:
-        print(f"✓ GPU detected: {torch.cuda.get_device_name(0)}")
+    if _gpu_available() and not args.no_gpu:
+        print(f"✓ GPU detected: {_gpu_device_name()}")
         print(f"  CUDA Version: {torch.version.cuda}")
         print("  GPU acceleration will be used for registration")
     else:
@@ -101,17 +229,19 @@ Examples:
         else:
             print("✗ No GPU detected - using CPU")
     
-    # Create output directories
+    # Create output directories, including the registration source directory
+    # that will contain both files
     os.makedirs(args.output, exist_ok=True)
+    src_dir = os.path.join(args.output, "registration_input")
+    os.makedirs(src_dir, exist_ok=True)
     
     # Step 1: Downsample HE file by 2x
     print("\n" + "="*70)
     print("Step 1: Downsampling HE file")
     print("="*70)
     
-    he_basename = os.path.basename(args.he_file)
-    he_name = os.path.splitext(he_basename)[0]
-    downsampled_he_path = os.path.join(args.output, f"{he_name}_downsampled_2x.tiff")
+    # Write the downsampled HE file directly into the source directory, so it is only written once
+    downsampled_he_path = os.path.join(src_dir, downsampled_he_basename)
     
     # Downsample the HE file
     downsampled_he_path = downsample_slide(args.he_file, downsampled_he_path, factor=2)
@@ -121,19 +251,10 @@ Examples:
     print("Step 2: Setting up VALIS registration")
     print("="*70)
     
-    # Create a temporary directory with both files
-    src_dir = os.path.join(args.output, "registration_input")
-    os.makedirs(src_dir, exist_ok=True)
-    
-    # Copy/link files to source directory
-    import shutil
-    cd8_dest = os.path.join(src_dir, os.path.basename(args.cd8_file))
-    he_dest = os.path.join(src_dir, os.path.basename(downsampled_he_path))
-    
-    if not os.path.exists(cd8_dest):
-        shutil.copy2(args.cd8_file, cd8_dest)
-    if not os.path.exists(he_dest):
-        shutil.copy2(downsampled_he_path, he_dest)
+    # Link CD8 file to source directory, to avoid copying a large slide. This is
+    # only a hardlink if the output directory is on the same filesystem as the CD8 file
+    cd8_dest = os.path.join(src_dir, cd8_basename)
+    link_file(args.cd8_file, cd8_dest)
     
     print(f"Registration source directory: {src_dir}")
     print(f"Registration results directory: {args.output}")
@@ -144,9 +265,9 @@ Examples:
     print("="*70)
     
     # Set CD8 as reference image (it will use channel 0 - DAPI)
-    reference_img = os.path.basename(args.cd8_file)
+    reference_img = cd8_basename
     print(f"Reference image: {reference_img} (using channel 0 - DAPI)")
-    print(f"Moving image: {os.path.basename(downsampled_he_path)} (HE downsampled 2x)")
+    print(f"Moving image: {downsampled_he_basename} (HE downsampled 2x)")
     
     # Configure processor for CD8 to use channel 0 (DAPI)
     # CD8 is fluorescence, so use ChannelGetter
@@ -23,6 +23,7 @@ from scipy import interpolate
 import pathlib
 from . warp_tools import get_affine_transformation_params, \
     get_corners_of_image, warp_xy
+from . import valtils
 
 # Cost functions #
 EPS = np.finfo("float").eps
@@ -842,13 +843,9 @@ class AffineOptimizerMattesMI(AffineOptimizer):
         rigid_map["NumberOfHistogramBins"] = [str(self.nbins)]
         
         # Enable GPU/OpenCL if available and not forced to CPU
-        if not self.force_cpu and torch.cuda.is_available():
-            try:
-                rigid_map["Resampler"] = ["OpenCLResampler"]
-                rigid_map["ResampleInterpolator"] = ["OpenCLBSplineInterpolator"]
-            except Exception:
-                # If OpenCL parameters are not supported, continue with CPU
-                pass
+        if valtils.use_elastix_opencl(self.force_cpu):
+            rigid_map["Resampler"] = ["OpenCLResampler"]
+            rigid_map["ResampleInterpolator"] = ["OpenCLBSplineInterpolator"]
         
         self.Reg.SetParameterMap(rigid_map)
 
@@ -200,6 +200,29 @@ class FeatureDD(object):
 
         return all_kp, all_desc
 
+    def batch_detect_and_compute(self, img_list, batch_size=8):
+        """Detect and describe features in a list of images
+
+        Subclasses that run on the GPU can override this to process
+        several images at once.
+
+        Parameters
+        ----------
+        img_list : list of ndarray
+            Images in which the features will be detected
+
+        batch_size : int
+            Number of images to process at once
+
+        Returns
+        -------
+        features_list : list of tuple
+            List of (kp_pos_xy, desc) for each image in `img_list`
+
+        """
+
+        return [self.detect_and_compute(img) for img in img_list]
+
 # Thin wrappers around OpenCV detectors and descriptors #
 
 
@@ -557,6 +580,78 @@ class KorniaFD(FeatureDD):
         self.device=device
         self.num_features=num_features
 
+    def _detect_and_compute_tensor(self, tensor_img):
+        """Detect and describe features in a batch of images
+
+        Parameters
+        ----------
+        tensor_img : torch.Tensor
+            Batch of images with shape (B, C, H, W), already on `device`
+
+        Returns
+        -------
+        features_list : list of tuple
+            List of (kp_pos_xy, desc) for each image in the batch
+
+        """
+
+    def _overrides_tensor_hook(self):
+        """Whether or not `_detect_and_compute_tensor` is defined by the subclass"""
+        return type(self)._detect_and_compute_tensor is not KorniaFD._detect_and_compute_tensor
+
+    def _detect_and_compute(self, image, *args, **kwargs):
+        if not self._overrides_tensor_hook():
+            msg = f"{type(self).__name__} must override either _detect_and_compute or _detect_and_compute_tensor"
+            raise NotImplementedError(msg)
+
+        tensor_img = preprocessing.img_to_tensor(image)
+        kp_pos_xy, desc = self._detect_and_compute_tensor(tensor_img.to(self.device).float())[0]
+
+        return kp_pos_xy, desc
+
+    def batch_detect_and_compute(self, img_list, batch_size=8):
+        """Detect and describe features in a list of images
+
+        Images that have the same shape are processed together, in batches
+        of `batch_size`. Images aren't padded to the same shape, since
+        the padding's edges would be detected as features, so features
+        are the same as when each image is processed separately.
+        Subclasses that only override `_detect_and_compute` process
+        one image at a time.
+
+        Parameters
+        ----------
+        img_list : list of ndarray
+            Images in which the features will be detected
+
+        batch_size : int
+            Number of images to process at once
+
+        Returns
+        -------
+        features_list : list of tuple
+            List of (kp_pos_xy, desc) for each image in `img_list`
+
+        """
+
+        if self.n_levels > 1 or not self._overrides_tensor_hook():
+            return super().batch_detect_and_compute(img_list, batch_size=batch_size)
+
+        shape_groups = {}
+        for i, img in enumerate(img_list):
+            shape_groups.setdefault(img.shape, []).append(i)
+
+        features_list = [None] * len(img_list)
+        for img_idx in shape_groups.values():
+            for i in range(0, len(img_idx), batch_size):
+                batch_idx = img_idx[i:i+batch_size]
+                tensor_batch = torch.cat([preprocessing.img_to_tensor(img_list[j]).float() for j in batch_idx])
+                batch_features = self._detect_and_compute_tensor(tensor_batch.to(self.device, non_blocking=True))
+                for j, features in zip(batch_idx, batch_features):
+                    features_list[j] = features
+
+        return features_list
+
 
 class DiskFD(KorniaFD):
     """
@@ -582,33 +677,29 @@ class DiskFD(KorniaFD):
         self.num_features = num_features
         self.quant_img = quant_image
 
-    def _detect_and_compute(self, image, *args, **kwargs):
-        """Detect the features in the image
+    def _detect_and_compute_tensor(self, tensor_img):
+        """Detect the features in a batch of images
 
         Parameters
         ----------
-        image : ndarray
-            Image in which the features will be detected. Can be
+        tensor_img : torch.Tensor
+            Batch of images with shape (B, C, H, W). Can be
             single channel or RGB
 
         Returns
         -------
-        kp : ndarry
-            (N, 2) array positions of keypoints in xy corrdinates for N
-            keypoints
-
-        desc : ndarry
+        features_list : list of tuple
+            List containing (kp, desc) for each image, where kp is a (N, 2)
+            array of keypoint positions in xy coordinates, and desc is a
             (N, M) array containing M features for each of the N keypoints
 
         """
 
-        tensor_img = preprocessing.img_to_tensor(image)
         with torch.inference_mode():
-            res = self.disk(tensor_img.to(self.device).float(), n=self.num_features, pad_if_not_divisible=True)[0]
-            kp_pos_xy = res.keypoints.detach().numpy()
-            desc = res.descriptors.detach().numpy()
+            res = self.disk(tensor_img, n=self.num_features, pad_if_not_divisible=True)
+            features_list = [(r.keypoints.detach().cpu().numpy(), r.descriptors.detach().cpu().numpy()) for r in res]
 
-        return kp_pos_xy, desc
+        return features_list
 
 
 class DeDoDeFD(KorniaFD):
@@ -637,31 +728,29 @@ class DeDoDeFD(KorniaFD):
         self.light_glue_feature_name = "dedodeg"
         self.num_features = num_features
 
-    def _detect_and_compute(self, image, *args, **kwargs):
-        """Detect the features in the image
+    def _detect_and_compute_tensor(self, tensor_img):
+        """Detect the features in a batch of images
 
         Parameters
         ----------
-        image : ndarray
-            Image in which the features will be detected. Can be
+        tensor_img : torch.Tensor
+            Batch of images with shape (B, C, H, W). Can be
             single channel or RGB
 
         Returns
         -------
-        kp : ndarry
-            (N, 2) array positions of keypoints in xy corrdinates for N
-            keypoints
-
-        desc : ndarry
+        features_list : list of tuple
+            List containing (kp, desc) for each image, where kp is a (N, 2)
+            array of keypoint positions in xy coordinates, and desc is a
             (N, M) array containing M features for each of the N keypoints
 
         """
 
-        tensor_img = preprocessing.img_to_tensor(image)
         with torch.inference_mode():
-            res = self.dedode(tensor_img.to(self.device).float(), n=self.num_features, pad_if_not_divisible=True)
-            kp_pos_xy = res[0].detach().squeeze(0).numpy()
-            scores = res[1].detach().numpy()
-            desc = res[2].detach().squeeze(0).numpy()
+            res = self.dedode(tensor_img, n=self.num_features, pad_if_not_divisible=True)
+            kp_pos_xy = res[0].detach().cpu().numpy()
+            desc = res[2].detach().cpu().numpy()
 
-        return kp_pos_xy, desc
+        features_list = list(zip(kp_pos_xy, desc))
+
+        return features_list
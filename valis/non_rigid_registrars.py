@@ -7,6 +7,8 @@ import torchvision.transforms as tv_transforms
 
 import os
 import pathlib
+import traceback
+import contextlib
 import cv2
 import numpy as np
 import SimpleITK as sitk
@@ -14,6 +16,7 @@ from skimage import transform, color, filters, exposure, util
 from skimage import color as skcolor
 import pyvips
 from copy import deepcopy
+from collections import OrderedDict
 import multiprocessing
 from pqdm.threads import pqdm
 import inspect
@@ -22,6 +25,15 @@ from . import warp_tools
 from . import preprocessing
 from . import valtils
 
+# Allow TF32 for float32 matmuls/convolutions on GPUs that support it
+torch.set_float32_matmul_precision("high")
+
+RAFT_TRT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "valis", "trt")
+"""str: Directory where TensorRT engines built for `RAFTWarper` are saved"""
+
+RAFT_BASE_GRID_CACHE_SIZE = 4
+"""int: Number of image shapes for which `RAFTWarper` keeps a sampling grid on the device"""
+
 NR_CLS_KEY = "non_rigid_registrar_cls"
 NR_PROCESSING_KW_KEY = "processer_kwargs"
 NR_PROCESSING_INIT_KW_KEY = "init_processer_kwargs"
@@ -730,16 +742,11 @@ class SimpleElastixWarper(NonRigidRegistrarXY):
         p["FinalGridSpacingInPhysicalUnits"] = [grid_spacing]
         p["WriteResultImage"] = ["false"]
         
-        # Enable GPU/OpenCL if available and not forced to CPU
-        if not force_cpu and torch.cuda.is_available():
-            # Try to enable GPU acceleration via OpenCL in Elastix
-            # Note: This requires Elastix to be compiled with OpenCL support
-            try:
-                p["Resampler"] = ["OpenCLResampler"]
-                p["ResampleInterpolator"] = ["OpenCLBSplineInterpolator"] 
-            except Exception:
-                # If OpenCL parameters are not supported, continue with CPU
-                pass
+        # Enable GPU/OpenCL if available and not forced to CPU.
+        # Requires Elastix to be compiled with OpenCL support, which is only checked once
+        if valtils.use_elastix_opencl(force_cpu):
+            p["Resampler"] = ["OpenCLResampler"]
+            p["ResampleInterpolator"] = ["OpenCLBSplineInterpolator"]
 
         return p
 
@@ -1061,7 +1068,7 @@ class RAFTWarper(NonRigidRegistrar):
     Dense optical flow fields may not be diffeomorphic, and so
     this class provides options to smooth displacement fields.
     """
-    def __init__(self, weights=Raft_Large_Weights.DEFAULT, transform_method="pad", device=None, rgb=True, quant_img=True, *args, **kwargs):
+    def __init__(self, weights=Raft_Large_Weights.DEFAULT, transform_method="pad", device=None, rgb=True, quant_img=True, use_tensorrt=True, *args, **kwargs):
         """
         Parameters
         ----------
@@ -1074,12 +1081,19 @@ class RAFTWarper(NonRigidRegistrar):
             "pad" will pad the image with 0s, "resize" will resize the image.
             These transformations are removed from the displacement fields
 
+        use_tensorrt : bool
+            Whether or not to compile RAFT when running on the GPU. A TensorRT
+            engine (FP16) will be built for each image shape and saved in
+            `RAFT_TRT_CACHE_DIR`. If torch_tensorrt is not installed, the model
+            will instead be compiled using `torch.compile`. Ignored when running
+            on the CPU.
+
         """
 
         super().__init__(rgb=rgb)
 
         if device is None:
-            device = "cuda" if torch.cuda.is_available() else "cpu"
+            device = valtils.get_device()
         self.device = device
 
         self.quant_img = quant_img
@@ -1088,6 +1102,281 @@ class RAFTWarper(NonRigidRegistrar):
         self.model = raft_large(weights=self.weights, progress=False).to(self.device)
         self.model.eval()
 
+        self.use_tensorrt = use_tensorrt and str(self.device).startswith("cuda")
+        self._compiled_models = {}
+        self._torch_compiled_model = None
+        self._checked_model_shapes = set()
+        self._base_grid_cache = OrderedDict()
+
+        # Persistent streams and pinned staging buffers, so they aren't created for each image pair
+        if str(self.device).startswith("cuda"):
+            self._copy_stream = torch.cuda.Stream(device=self.device)
+            self._compute_stream = torch.cuda.Stream(device=self.device)
+        else:
+            self._copy_stream = None
+            self._compute_stream = None
+
+        self._pinned_buffers = [None, None]
+        self._pinned_buffer_events = [None, None]
+        self._pinned_buffer_idx = 0
+
+    def compile_model(self, img_h, img_w):
+        """Compile RAFT for images with shape (`img_h`, `img_w`)
+
+        Tries to load or build a TensorRT engine for that shape. If
+        torch_tensorrt is not installed, `torch.compile` is used instead.
+
+        """
+
+        try:
+            import torch_tensorrt
+        except ImportError:
+            # torch.compile handles new shapes on its own, so only compile once
+            if self._torch_compiled_model is None:
+                self._torch_compiled_model = torch.compile(self.model, mode="reduce-overhead")
+
+            return self._torch_compiled_model
+
+        engine_f = self.get_engine_f(img_h, img_w, getattr(torch_tensorrt, "__version__", "unknown"))
+        if os.path.exists(engine_f):
+            try:
+                return torch_tensorrt.load(engine_f).module()
+            except Exception as e:
+                msg = f"Unable to load TensorRT engine {engine_f}, so it will be rebuilt. Error was:\n{e}"
+                valtils.print_warning(msg)
+                os.remove(engine_f)
+
+        example_inputs = [torch.zeros((1, 3, img_h, img_w), device=self.device) for _ in range(2)]
+        trt_model = torch_tensorrt.compile(self.model, ir="dynamo",
+                                           inputs=example_inputs,
+                                           enabled_precisions={torch.half})
+
+        pathlib.Path(RAFT_TRT_CACHE_DIR).mkdir(exist_ok=True, parents=True)
+        torch_tensorrt.save(trt_model, engine_f, inputs=example_inputs)
+
+        return trt_model
+
+    def get_engine_f(self, img_h, img_w, trt_version):
+        """Get name of the file where the TensorRT engine for images with shape (`img_h`, `img_w`) is saved
+
+        Engines only work on the GPU and TensorRT version they were built with,
+        so both are part of the file name.
+
+        """
+
+        weights_name = getattr(self.weights, "name", str(self.weights))
+        if str(self.device).startswith("cuda"):
+            device_name = torch.cuda.get_device_name(self.device)
+        else:
+            device_name = str(self.device)
+
+        engine_name = f"raft_{weights_name}_{img_h}x{img_w}_{device_name}_trt{trt_version}"
+        engine_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in engine_name)
+
+        return os.path.join(RAFT_TRT_CACHE_DIR, f"{engine_name}.ep")
+
+    def get_model(self, img_shape_rc):
+        """Get model that will estimate optical flow for images with shape `img_shape_rc`
+
+        Compiled models are cached by image shape. If compilation fails,
+        the eager model is used for that shape. Failures that only happen
+        when the compiled model is first called are handled by `run_model`.
+
+        """
+
+        if not self.use_tensorrt:
+            return self.model
+
+        img_shape_rc = tuple(int(x) for x in img_shape_rc)
+        if img_shape_rc not in self._compiled_models:
+            try:
+                compiled_model = self.compile_model(*img_shape_rc)
+            except Exception as e:
+                traceback_msg = traceback.format_exc()
+                msg = f"Unable to compile RAFT for images with shape {img_shape_rc}, so using uncompiled model. Error was:\n{e}"
+                valtils.print_warning(msg, traceback_msg=traceback_msg)
+                compiled_model = self.model
+
+            self._compiled_models[img_shape_rc] = compiled_model
+
+        return self._compiled_models[img_shape_rc]
+
+    def run_model(self, img_shape_rc, fixed_img, moving_img):
+        """Estimate optical flow between images with shape `img_shape_rc`
+
+        Compiled models may only compile when first called (e.g. `torch.compile`),
+        so if that first call fails, the eager model is used for that shape.
+
+        """
+
+        img_shape_rc = tuple(int(x) for x in img_shape_rc)
+        model = self.get_model(img_shape_rc)
+        if model is self.model or img_shape_rc in self._checked_model_shapes:
+            return model(fixed_img, moving_img)
+
+        try:
+            list_of_flows = model(fixed_img, moving_img)
+        except Exception as e:
+            traceback_msg = traceback.format_exc()
+            msg = f"Unable to run compiled RAFT for images with shape {img_shape_rc}, so using uncompiled model. Error was:\n{e}"
+            valtils.print_warning(msg, traceback_msg=traceback_msg)
+            self._compiled_models[img_shape_rc] = self.model
+            if model is self._torch_compiled_model:
+                # torch.compile would fail for other shapes too
+                self._torch_compiled_model = self.model
+
+            list_of_flows = self.model(fixed_img, moving_img)
+
+        self._checked_model_shapes.add(img_shape_rc)
+
+        return list_of_flows
+
+    def to_device(self, tensor_list):
+        """Copy tensors to `device`
+
+        When using the GPU, the tensors are first packed into a single pinned
+        host buffer so that they can be copied in one transfer, instead of one
+        per tensor. The copy is done on a separate stream, and the current
+        stream waits for it to finish before using the tensors.
+
+        """
+
+        if not str(self.device).startswith("cuda"):
+            return [t.to(self.device) for t in tensor_list]
+
+        n_per_tensor = [t.numel() for t in tensor_list]
+        staging, buffer_idx = self.get_pinned_buffer(sum(n_per_tensor), tensor_list[0].dtype)
+        start_idx = 0
+        for t, n in zip(tensor_list, n_per_tensor):
+            staging[start_idx:start_idx+n].copy_(t.reshape(-1))
+            start_idx += n
+
+        current_stream = torch.cuda.current_stream(self.device)
+        self._copy_stream.wait_stream(current_stream)
+        with torch.cuda.stream(self._copy_stream):
+            device_staging = staging.to(self.device, non_blocking=True)
+            copy_event = torch.cuda.Event()
+            copy_event.record(self._copy_stream)
+
+        # Buffer can't be overwritten until this copy has finished
+        self._pinned_buffer_events[buffer_idx] = copy_event
+        current_stream.wait_stream(self._copy_stream)
+        device_staging.record_stream(current_stream)
+        device_tensor_list = [x.view(t.shape) for x, t in zip(torch.split(device_staging, n_per_tensor), tensor_list)]
+
+        return device_tensor_list
+
+    def get_pinned_buffer(self, n, dtype):
+        """Get a pinned host buffer that can hold `n` values of type `dtype`
+
+        Two buffers are used in turn, so that one can be filled while
+        the other is being copied to the GPU. Buffers are only
+        re-allocated when they need to be larger.
+
+        Returns
+        -------
+        buffer : torch.Tensor
+            1D pinned tensor with `n` elements
+
+        buffer_idx : int
+            Index of the buffer, used to track when its copy has finished
+
+        """
+
+        buffer_idx = self._pinned_buffer_idx
+        self._pinned_buffer_idx = 1 - buffer_idx
+
+        pending_copy = self._pinned_buffer_events[buffer_idx]
+        if pending_copy is not None:
+            pending_copy.synchronize()
+            self._pinned_buffer_events[buffer_idx] = None
+
+        buffer = self._pinned_buffers[buffer_idx]
+        if buffer is None or buffer.dtype != dtype or buffer.numel() < n:
+            # Buffers may be first needed inside `torch.inference_mode()` (e.g. in `calc`),
+            # but are refilled outside of it too, so they can't be inference tensors
+            with torch.inference_mode(False):
+                buffer = torch.empty(n, dtype=dtype, pin_memory=True)
+
+            self._pinned_buffers[buffer_idx] = buffer
+
+        return buffer[:n], buffer_idx
+
+    def get_base_grid(self, img_shape_rc):
+        """Get (H, W, 2) tensor containing the xy position of each pixel
+
+        Grids are kept on `device`, so they can be reused when warping
+        images with the same shape. Only the grids for the last
+        `RAFT_BASE_GRID_CACHE_SIZE` shapes are kept, since tiles at the
+        edges of a slide can each have a different shape.
+
+        """
+
+        img_shape_rc = tuple(int(x) for x in img_shape_rc)
+        if img_shape_rc in self._base_grid_cache:
+            self._base_grid_cache.move_to_end(img_shape_rc)
+            return self._base_grid_cache[img_shape_rc]
+
+        grid_r, grid_c = torch.meshgrid(torch.arange(img_shape_rc[0], dtype=torch.float32),
+                                        torch.arange(img_shape_rc[1], dtype=torch.float32),
+                                        indexing="ij")
+
+        base_grid = torch.stack([grid_c, grid_r], dim=-1).to(self.device)
+        self._base_grid_cache[img_shape_rc] = base_grid
+        while len(self._base_grid_cache) > RAFT_BASE_GRID_CACHE_SIZE:
+            self._base_grid_cache.popitem(last=False)
+
+        return base_grid
+
+    def warp_img_on_device(self, img, bk_dxdy, interp_method="bicubic"):
+        """Warp an image on `device` using the displacement field `bk_dxdy`
+
+        Equivalent to `warp_tools.warp_img(img, bk_dxdy=bk_dxdy)`, but
+        uses `torch.nn.functional.grid_sample`.
+
+        """
+
+        img_shape_rc = img.shape[0:2]
+        img_tensor = torch.from_numpy(img.astype(np.float32))
+        if img.ndim == 2:
+            img_tensor = img_tensor[None, None]
+        else:
+            img_tensor = img_tensor.permute(2, 0, 1).unsqueeze(0)
+
+        dxdy_tensor = torch.from_numpy(np.dstack(bk_dxdy).astype(np.float32))
+        img_tensor, dxdy_tensor = self.to_device([img_tensor, dxdy_tensor])
+
+        # Sample positions, normalized to [-1, 1]
+        sample_xy = self.get_base_grid(img_shape_rc) + dxdy_tensor
+        max_xy = torch.tensor([max(img_shape_rc[1] - 1, 1), max(img_shape_rc[0] - 1, 1)], device=sample_xy.device)
+        sample_xy = 2*sample_xy/max_xy - 1
+
+        with torch.inference_mode():
+            warped = torch.nn.functional.grid_sample(img_tensor, sample_xy.unsqueeze(0),
+                                                     mode=interp_method,
+                                                     padding_mode="zeros",
+                                                     align_corners=True)
+
+        warped = warped.squeeze(0).permute(1, 2, 0).cpu().numpy()
+        if img.ndim == 2:
+            warped = warped[..., 0]
+
+        if np.issubdtype(img.dtype, np.integer):
+            dtype_info = np.iinfo(img.dtype)
+            warped = np.clip(np.round(warped), dtype_info.min, dtype_info.max)
+
+        return warped.astype(img.dtype)
+
+    def get_warped_img_and_grid(self, bk_dxdy):
+        if not str(self.device).startswith("cuda") or isinstance(self.moving_img, pyvips.Image):
+            return super().get_warped_img_and_grid(bk_dxdy)
+
+        warped_img = self.warp_img_on_device(self.moving_img, bk_dxdy)
+        grid_img = self.get_grid_image(grid_spacing=16)
+        warp_grid = self.warp_img_on_device(grid_img, bk_dxdy)
+
+        return warped_img, warp_grid
+
     def prep_img_for_raft(self, img, dim_div=8, method="pad"):
         """
         3 channels. Dimensions divisible by 8
@@ -1137,8 +1426,17 @@ class RAFTWarper(NonRigidRegistrar):
 
         transformed_moving_img, transformed_fixed_img = self.weights.transforms()(transformed_moving_img, transformed_fixed_img)
 
-        list_of_flows = self.model(transformed_fixed_img.to(self.device), transformed_moving_img.to(self.device))
-        dxdy = list_of_flows[-1].squeeze(0).detach().numpy()
+        use_amp = str(self.device).startswith("cuda")
+        if self._compute_stream is not None:
+            stream_context = torch.cuda.stream(self._compute_stream)
+        else:
+            stream_context = contextlib.nullcontext()
+
+        with stream_context, torch.inference_mode(), torch.autocast("cuda", dtype=torch.float16, enabled=use_amp):
+            device_fixed_img, device_moving_img = self.to_device([transformed_fixed_img, transformed_moving_img])
+            list_of_flows = self.run_model(transformed_moving_img.shape[-2:], device_fixed_img, device_moving_img)
+            # Copying to the CPU waits for the model to finish on the compute stream
+            dxdy = list_of_flows[-1].squeeze(0).float().cpu().numpy()
 
         if self.transform_method == "pad" and len(moving_transform) == 4:
             # Remove padding
@@ -1239,12 +1537,9 @@ class SimpleElastixGroupwiseWarper(NonRigidRegistrarGroupwise):
         p["WriteResultImage"] = ["false"]
         
         # Enable GPU/OpenCL if available and not forced to CPU
-        if not force_cpu and torch.cuda.is_available():
-            try:
-                p["Resampler"] = ["OpenCLResampler"]
-                p["ResampleInterpolator"] = ["OpenCLBSplineInterpolator"]
-            except Exception:
-                pass
+        if valtils.use_elastix_opencl(force_cpu):
+            p["Resampler"] = ["OpenCLResampler"]
+            p["ResampleInterpolator"] = ["OpenCLBSplineInterpolator"]
 
         return p
 
@@ -17,6 +17,7 @@ from skimage import transform, exposure, filters
 from skimage import color as skcolor
 from time import time
 import tqdm
+from pqdm.threads import pqdm
 import pandas as pd
 import pickle
 import colour
@@ -1731,6 +1732,20 @@ class Valis(object):
         Dictionary of `Slide` objects that have empty images. Ignored during
         registration but added back at the end
 
+    _slide_lookup : dictionary
+        Dictionary used by `get_slide` to find the `Slide` associated with
+        a filename, path, or name. Values are lists of matching files when a
+        name is shared by several images. Set to `None` when `slide_dict`
+        changes, and rebuilt when next needed
+
+    _sorted_img_f_list : list
+        Cached result of `get_sorted_img_f_list`. Set to `None` when
+        `slide_dict` or the order of the slides changes
+
+    _live_sorted_img_f_list : list
+        Cached result of `get_live_sorted_img_f_list`. Set to `None` at the
+        same time as `_sorted_img_f_list`
+
 
     Examples
     --------
@@ -2198,6 +2213,9 @@ class Valis(object):
         self.error_df = None
 
         self._empty_slides = {}
+        self._slide_lookup = None
+        self._sorted_img_f_list = None
+        self._live_sorted_img_f_list = None
 
     def __repr__(self):
         repr_str = (f'<{self.__class__.__name__}, name = {self.name}>'
@@ -2290,6 +2308,8 @@ class Valis(object):
             self.size += 1
             self.slide_dict[slide_name] = slide_obj
 
+        self._clear_slide_caches()
+
     def get_imgs_in_dir(self):
         """Get all images in Valis.src_dir
 
@@ -2379,37 +2399,27 @@ class Valis(object):
 
         """
 
-        default_name = valtils.get_name(src_f)
-
-        if src_f in self.name_dict.keys():
-            # src_f is full path to image
-            assigned_name = self.name_dict[src_f]
-        elif src_f in self.name_dict.values():
-            # src_f is name of image
-            assigned_name = src_f
-        else:
-            # src_f isn't in name_dict
-            assigned_name = None
-
-        if default_name in self.slide_dict:
-            # src_f is the image name or file name
-            slide_obj = self.slide_dict[default_name]
-
-        elif assigned_name in self.slide_dict:
-            # src_f is full path and name was looked up
-            slide_obj = self.slide_dict[assigned_name]
+        slide_lookup = getattr(self, "_slide_lookup", None)
+        if slide_lookup is None:
+            slide_lookup = self._build_slide_lookup()
 
-        elif src_f in self.slide_dict:
-            # src_f is the name of the slide
-            slide_obj = self.slide_dict[src_f]
+        default_name = None
+        slide_obj = slide_lookup.get(src_f)
+        if slide_obj is None:
+            default_name = valtils.get_name(src_f)
+            slide_obj = slide_lookup.get(default_name)
 
-        elif default_name in self._dup_names_dict:
+        if isinstance(slide_obj, list):
             # default name has multiple matches
-            n_matching = len(self._dup_names_dict[default_name])
-            possible_names_dict = {f: self.name_dict[f] for f in self._dup_names_dict[default_name]}
+            if default_name is None:
+                default_name = valtils.get_name(src_f)
+
+            matching_f = self._dup_names_dict.get(default_name, slide_obj)
+            n_matching = len(matching_f)
+            possible_names_dict = {f: self.name_dict[f] for f in matching_f if f in self.name_dict}
 
             msg = (f"\n{src_f} matches {n_matching} images in this dataset:\n"
-                   f"{pformat(self._dup_names_dict[default_name])}"
+                   f"{pformat(matching_f)}"
                    f"\n\nPlease see `Valis.name_dict` to find correct name in "
                    f"the dictionary. Either key (filenmae) or value (assigned name) will work:\n"
                    f"{pformat(possible_names_dict)}")
@@ -2417,12 +2427,50 @@ class Valis(object):
             valtils.print_warning(msg, rgb=Fore.RED)
             slide_obj = None
 
-        else:
-            # No match found for src_f
-            slide_obj = None
-
         return slide_obj
 
+    def _clear_slide_caches(self):
+        """Clear cached slide lookups after `slide_dict` or the slide order changes
+        """
+        self._slide_lookup = None
+        self._sorted_img_f_list = None
+        self._live_sorted_img_f_list = None
+
+    def _build_slide_lookup(self):
+        """Create dictionary used by `get_slide` to find Slides
+
+        Maps each image's path, file name, default name, and assigned name to
+        its `Slide`. Names or file names shared by several images map to a list
+        of the matching files instead.
+
+        """
+
+        slide_lookup = {}
+        aliased_f = {}
+        for f, assigned_name in self.name_dict.items():
+            slide_obj = self.slide_dict.get(assigned_name)
+            for alias in (os.path.basename(f), valtils.get_name(f)):
+                aliased_f.setdefault(alias, [])
+                if f not in aliased_f[alias]:
+                    aliased_f[alias].append(f)
+
+                if len(aliased_f[alias]) > 1:
+                    slide_lookup[alias] = aliased_f[alias]
+                else:
+                    slide_lookup[alias] = slide_obj
+
+        for default_name, dup_f_list in self._dup_names_dict.items():
+            slide_lookup[default_name] = list(dup_f_list)
+
+        # Exact matches take precedence over file names and default names
+        slide_lookup.update(self.slide_dict)
+        for f, assigned_name in self.name_dict.items():
+            slide_lookup[f] = self.slide_dict.get(assigned_name)
+
+        self._slide_lookup = slide_lookup
+
+        return slide_lookup
+
     def get_ref_slide(self):
         ref_slide = self.get_slide(self.reference_img_f)
 
@@ -2567,17 +2615,18 @@ class Valis(object):
         named_reader_dict = self.create_img_reader_dict(reader_dict=reader_dict,
                                                         default_reader=reader_cls,
                                                         series=series)
-        img_types = []
-        self.size = 0
-        for f in tqdm.tqdm(self.original_img_list, desc=CONVERT_MSG, unit="image"):
+        # Skip slides that failed to load a reader. Warnings printed here to avoid interleaving with progress bar
+        img_f_list = []
+        for f in self.original_img_list:
             slide_name = valtils.get_name(f)
-            
-            # Skip slides that failed to load a reader
             if slide_name not in named_reader_dict:
                 valtils.print_warning(f"'{slide_name}'")
                 continue
-            
-            reader = named_reader_dict[slide_name]
+
+            img_f_list.append(f)
+
+        def _convert_img(f):
+            reader = named_reader_dict[valtils.get_name(f)]
             slide_dims = reader.metadata.slide_dimensions
             levels_in_range = np.where(slide_dims.max(axis=1) <= self.max_image_dim_px)[0]
 
@@ -2596,9 +2645,6 @@ class Valis(object):
 
             img = warp_tools.vips2numpy(vips_img)
 
-
-
-
             slide_name = self.name_dict[f]
             slide_obj = Slide(f, img, self, reader, name=slide_name)
             slide_obj.crop = self.crop
@@ -2617,6 +2663,19 @@ class Valis(object):
                 slide_obj.resolution = np.mean(self.resolution_xyu[0:2])
                 slide_obj.units = self.resolution_xyu[2]
 
+            return slide_obj
+
+        # Reading slides is mostly I/O, so read several at once
+        n_workers = min(8, len(img_f_list))
+        if n_workers > 1:
+            slide_obj_list = pqdm(img_f_list, _convert_img, n_jobs=n_workers,
+                                  exception_behaviour="immediate", desc=CONVERT_MSG, unit="image")
+        else:
+            slide_obj_list = [_convert_img(f) for f in tqdm.tqdm(img_f_list, desc=CONVERT_MSG, unit="image")]
+
+        img_types = []
+        self.size = 0
+        for slide_obj in slide_obj_list:
             if slide_obj.is_empty:
                 msg = f"{slide_obj.name} appears to be empty and will be skipped during registration"
                 valtils.print_warning(msg)
@@ -2627,6 +2686,8 @@ class Valis(object):
             self.slide_dict[slide_obj.name] = slide_obj
             self.size += 1
 
+        self._clear_slide_caches()
+
         if self.image_type is None:
             unique_img_types = list(set(img_types))
             if len(unique_img_types) > 1:
@@ -3531,6 +3592,9 @@ class Valis(object):
             slide_obj.xy_matched_to_prev = match_dict[slide_obj.name]
             slide_obj.xy_in_prev = match_dict[fixed_slide.name]
 
+        # Slide order may have changed
+        self._clear_slide_caches()
+
         self.create_crop_masks()
         overlap_mask, overlap_mask_bbox_xywh = self.get_crop_mask(self.crop)
 
@@ -4947,6 +5011,8 @@ class Valis(object):
             del self.slide_dict[empty_slide_name]
             self.size -= 1
 
+        self._clear_slide_caches()
+
         ref_slide = self.get_ref_slide()
         if ref_slide is None:
             msg = "Reference slide failed to load. Cannot perform micro-registration."
@@ -5124,6 +5190,8 @@ class Valis(object):
             self.slide_dict[empty_slide_name] = empty_slide
             self.size += 1
 
+        self._clear_slide_caches()
+
         pickle.dump(self, open(self.reg_f, 'wb'))
 
         micro_overlap = self.draw_overlap_img(micro_reg_imgs)
@@ -5174,18 +5242,50 @@ class Valis(object):
         return aligned_out_shape_rc
 
     def get_sorted_img_f_list(self):
-        img_idx = [slide_obj.stack_idx for slide_obj in self.slide_dict.values()]
-        img_order = np.argsort(img_idx)
-        src_f_list = [self.original_img_list[i] for i in img_order]
+        src_f_list = getattr(self, "_sorted_img_f_list", None)
+        if src_f_list is None:
+            img_idx = [slide_obj.stack_idx for slide_obj in self.slide_dict.values()]
+            img_order = np.argsort(img_idx)
+            src_f_list = [self.original_img_list[i] for i in img_order]
+            self._sorted_img_f_list = src_f_list
+
+        return list(src_f_list)
+
+    def get_live_sorted_img_f_list(self):
+        """Get sorted list of images whose slides loaded successfully
+
+        Images without a `Slide` are reported once, when the list is created,
+        and are left out of the list.
+
+        Returns
+        -------
+        src_f_list : list of str
+            Paths to images, in the same order as `get_sorted_img_f_list`
+
+        """
+
+        src_f_list = getattr(self, "_live_sorted_img_f_list", None)
+        if src_f_list is None:
+            src_f_list = []
+            for src_f in self.get_sorted_img_f_list():
+                if self.get_slide(src_f) is None:
+                    msg = f"Skipping '{src_f}' because slide failed to load"
+                    valtils.print_warning(msg, rgb=Fore.RED)
+                    continue
+
+                src_f_list.append(src_f)
+
+            self._live_sorted_img_f_list = src_f_list
 
-        return src_f_list
+        return list(src_f_list)
 
     @valtils.deprecated_args(perceputally_uniform_channel_colors="colormap")
     def warp_and_save_slides(self, dst_dir, level=0, non_rigid=True,
                              crop=True,
                              colormap=slide_io.CMAP_AUTO,
                              interp_method="bicubic",
-                             tile_wh=None, compression=DEFAULT_COMPRESSION, Q=100, pyramid=True):
+                             tile_wh=None, compression=DEFAULT_COMPRESSION, Q=100, pyramid=True,
+                             n_workers=1):
 
         f"""Warp and save all slides
 
@@ -5230,10 +5330,17 @@ class Valis(object):
         Q : int
             Q factor for lossy compression
 
+        n_workers : int
+            Number of slides to warp and save at the same time. Default is 1.
+            Using more than 1 overlaps reading one slide with warping and writing
+            another, but increases peak memory, since several full resolution
+            slides may be warped at once. Progress bars of slides being saved
+            at the same time will overlap.
+
         """
         pathlib.Path(dst_dir).mkdir(exist_ok=True, parents=True)
 
-        src_f_list = self.get_sorted_img_f_list()
+        src_f_list = self.get_live_sorted_img_f_list()
         cmap_is_str = False
         named_color_map = None
         if colormap is not None:
@@ -5250,16 +5357,12 @@ class Valis(object):
                         msg = f"Skipping colormap for '{x}' because slide failed to load"
                         valtils.print_warning(msg)
 
-        for src_f in tqdm.tqdm(src_f_list, desc=SAVING_IMG_MSG, unit="image"):
+        # Determine how each slide will be saved. Done here so that warnings aren't printed from worker threads
+        warp_kwargs_list = []
+        for src_f in src_f_list:
             slide_obj = self.get_slide(src_f)
-            
-            # Skip slides that failed to load
-            if slide_obj is None:
-                msg = f"Skipping '{src_f}' in warp_and_save_slides because slide failed to load"
-                valtils.print_warning(msg, rgb=Fore.RED)
-                continue
-            
             slide_cmap = None
+            updated_channel_names = None
             is_rgb = slide_obj.reader.metadata.is_rgb
             if is_rgb:
                 updated_channel_names = None
@@ -5280,18 +5383,32 @@ class Valis(object):
 
             dst_f = os.path.join(dst_dir, slide_obj.name + ".ome.tiff")
 
+            warp_kwargs_list.append({"slide_obj": slide_obj,
+                                     "dst_f": dst_f,
+                                     "colormap": slide_cmap,
+                                     "channel_names": updated_channel_names})
+
+        def _warp_and_save(slide_obj, dst_f, colormap, channel_names):
             slide_obj.warp_and_save_slide(dst_f=dst_f, level=level,
                                           non_rigid=non_rigid,
                                           crop=crop,
                                           src_f=slide_obj.src_f,
                                           interp_method=interp_method,
-                                          colormap=slide_cmap,
+                                          colormap=colormap,
                                           tile_wh=tile_wh,
                                           compression=compression,
-                                          channel_names=updated_channel_names,
+                                          channel_names=channel_names,
                                           Q=Q,
                                           pyramid=pyramid)
 
+        n_workers = min(n_workers, len(warp_kwargs_list))
+        if n_workers > 1:
+            pqdm(warp_kwargs_list, _warp_and_save, n_jobs=n_workers, argument_type="kwargs",
+                 exception_behaviour="immediate", desc=SAVING_IMG_MSG, unit="image")
+        else:
+            for warp_kwargs in tqdm.tqdm(warp_kwargs_list, desc=SAVING_IMG_MSG, unit="image"):
+                _warp_and_save(**warp_kwargs)
+
 
     @valtils.deprecated_args(perceputally_uniform_channel_colors="colormap")
     def warp_and_merge_slides(self, dst_f=None, level=0, non_rigid=True,
@@ -518,15 +518,25 @@ class SerialRigidRegistrar(object):
             img_obj.padded_shape_rc = out_shape
             img_obj.T = warp_tools.get_padding_matrix(img.shape, img_obj.padded_shape_rc)
 
-            if feature_detector is not None:
-                detect_img = self.get_fd_detection_img(img_obj, feature_detector=feature_detector, valis_obj=valis_obj)
-                img_obj.kp_pos_xy, img_obj.desc = feature_detector.detect_and_compute(detect_img)
-
             img_obj_list[i] = img_obj
             self.img_obj_dict[img_name] = img_obj
             if qt_emitter is not None:
                 qt_emitter.emit(1)
 
+        if feature_detector is not None:
+            # Detect features in all images together so that GPU feature detectors can process them in batches
+            detect_img_list = [self.get_fd_detection_img(img_obj, feature_detector=feature_detector, valis_obj=valis_obj)
+                               for img_obj in img_obj_list]
+
+            batch_detect_and_compute = getattr(feature_detector, "batch_detect_and_compute", None)
+            if batch_detect_and_compute is not None:
+                features_list = batch_detect_and_compute(detect_img_list)
+            else:
+                # Feature detectors that don't subclass FeatureDD may only define detect_and_compute
+                features_list = [feature_detector.detect_and_compute(img) for img in detect_img_list]
+            for img_obj, (kp_pos_xy, desc) in zip(img_obj_list, features_list):
+                img_obj.kp_pos_xy, img_obj.desc = kp_pos_xy, desc
+
         self.img_obj_list = img_obj_list
         self.features = feature_detector.__class__.__name__
 
@@ -3637,13 +3637,13 @@ def save_ome_tiff(img, dst_f, ome_xml=None, tile_wh=512, compression=DEFAULT_COM
         total = 100*image_bands
     tic = time.time()
 
-    save_ome_tiff.n_complete = -1
-    save_ome_tiff.current_im = None
+    # Progress is tracked per call, so that slides can be saved at the same time
+    progress_state = {"n_complete": -1, "current_im": None}
     def eval_handler(im, progress):
-        if save_ome_tiff.current_im != progress.im:
-            save_ome_tiff.n_complete += 1
-        save_ome_tiff.current_im = progress.im
-        count = save_ome_tiff.n_complete*100 + progress.percent
+        if progress_state["current_im"] != progress.im:
+            progress_state["n_complete"] += 1
+        progress_state["current_im"] = progress.im
+        count = progress_state["n_complete"]*100 + progress.percent
         filled_len = int(round(bar_len * count / float(total)))
         percents = round(100.0 * count / float(total), 1)
         bar = '=' * filled_len + '-' * (bar_len - filled_len)
@@ -88,6 +88,7 @@ def check_m1_mac():
 
 
 from . import slide_tools # Put import here to avoid circular imports
+@functools.lru_cache(maxsize=4096)
 def get_name(f):
 
     fonly = os.path.split(f)[1]
@@ -227,9 +228,13 @@ def get_ncpus_available():
     return int(ncpus)
 
 
+@functools.lru_cache(maxsize=None)
 def is_gpu_available():
     """Check if GPU is available for computation
-    
+
+    Result is cached, so the CUDA driver is only queried once.
+    Call `_reset_device_cache` to check again.
+
     Returns
     -------
     bool
@@ -241,6 +246,7 @@ def is_gpu_available():
         return False
 
 
+@functools.lru_cache(maxsize=None)
 def get_device(force_cpu=False):
     """Get the device to use for computation
     
@@ -258,3 +264,65 @@ def get_device(force_cpu=False):
         return 'cpu'
     return 'cuda' if is_gpu_available() else 'cpu'
 
+
+@functools.lru_cache(maxsize=None)
+def is_elastix_opencl_available():
+    """Check if SimpleITK's elastix can use the OpenCL resampler
+
+    Only elastix builds compiled with OpenCL support can use it, so this
+    runs a tiny registration with the OpenCL resampler the first time it is
+    called. The result is cached.
+
+    Returns
+    -------
+    bool
+        True if a GPU is available and elastix can use the OpenCL resampler
+    """
+    if not is_gpu_available():
+        return False
+
+    try:
+        import numpy as np
+        import SimpleITK as sitk
+
+        img = sitk.GetImageFromArray(np.random.default_rng(0).random((32, 32), dtype=np.float32))
+        p = sitk.GetDefaultParameterMap("translation")
+        p["NumberOfResolutions"] = ["1"]
+        p["MaximumNumberOfIterations"] = ["1"]
+        p["Resampler"] = ["OpenCLResampler"]
+        p["ResampleInterpolator"] = ["OpenCLBSplineInterpolator"]
+
+        elastix_image_filter_obj = sitk.ElastixImageFilter()
+        elastix_image_filter_obj.LogToConsoleOff()
+        elastix_image_filter_obj.SetFixedImage(img)
+        elastix_image_filter_obj.SetMovingImage(img)
+        elastix_image_filter_obj.SetParameterMap(p)
+        elastix_image_filter_obj.Execute()
+
+        return True
+    except Exception:
+        return False
+
+
+def use_elastix_opencl(force_cpu=False):
+    """Determine if elastix should use the OpenCL resampler
+
+    Parameters
+    ----------
+    force_cpu : bool, optional
+        If True, force CPU usage even if GPU is available. Default is False.
+
+    Returns
+    -------
+    bool
+        True if not forced to use the CPU and elastix can use OpenCL
+    """
+    return not force_cpu and is_elastix_opencl_available()
+
+
+def _reset_device_cache():
+    """Clear cached results of `is_gpu_available`, `get_device`, and `is_elastix_opencl_available`
+    """
+    is_gpu_available.cache_clear()
+    get_device.cache_clear()
+    is_elastix_opencl_available.cache_clear()
@@ -6,16 +6,27 @@ This script validates the basic logic without requiring full dependencies
 
 import sys
 import importlib.util
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
 
 def check_module_exists(module_name):
     """Check if a module can be imported"""
     spec = importlib.util.find_spec(module_name)
     return spec is not None
 
+def _compile_one(path):
+    """Compile a file in memory, returning (path, error message or None)
+
+    Only the syntax is checked, so no bytecode is written to __pycache__
+    """
+    try:
+        compile(pathlib.Path(path).read_bytes(), path, "exec")
+    except (SyntaxError, ValueError) as e:
+        return path, str(e)
+    return path, None
+
 def verify_syntax():
     """Verify Python syntax of modified files"""
-    import py_compile
-    
     files_to_check = [
         'valis/valtils.py',
         'valis/non_rigid_registrars.py', 
@@ -26,13 +37,16 @@ def verify_syntax():
     ]
     
     print("Checking Python syntax...")
+    # Files are independent, so compile them in parallel
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(_compile_one, files_to_check))
+    
     all_valid = True
-    for file in files_to_check:
-        try:
-            py_compile.compile(file, doraise=True)
+    for file, error in results:
+        if error is None:
             print(f"  ✓ {file}")
-        except py_compile.PyCompileError as e:
-            print(f"  ✗ {file}: {e}")
+        else:
+            print(f"  ✗ {file}: {error}")
             all_valid = False
     
     return all_valid
@@ -81,6 +95,7 @@ def verify_logic():
 def verify_file_structure():
     """Verify all expected files exist"""
     import os
+    from collections import defaultdict
     
     print("\nVerifying file structure...")
     expected_files = [
@@ -94,9 +109,23 @@ def verify_file_structure():
         'README.rst'
     ]
     
+    # List each directory once, instead of checking each file separately
+    files_by_dir = defaultdict(list)
+    for file in expected_files:
+        files_by_dir[os.path.dirname(file)].append(file)
+    
+    existing_files = set()
+    for dir_name, dir_files in files_by_dir.items():
+        try:
+            with os.scandir(dir_name or '.') as entries:
+                names = {entry.name for entry in entries}
+        except FileNotFoundError:
+            continue
+        existing_files.update(f for f in dir_files if os.path.basename(f) in names)
+    
     all_exist = True
     for file in expected_files:
-        if os.path.exists(file):
+        if file in existing_files:
             print(f"  ✓ {file}")
         else:
             print(f"  ✗ {file} (missing)")